@@ -8,12 +8,16 @@ It keeps a loggedin.txt file so every tiny session looks like:
 """
 from __future__ import annotations
 
+import atexit
+import os
 import random
+import re
 import subprocess
+import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CARS_FILE = PROJECT_ROOT / "cars.txt"
@@ -22,16 +26,58 @@ MANAGERS_FILE = PROJECT_ROOT / "managers.txt"
 LOGGEDIN_FILE = PROJECT_ROOT / "loggedin.txt"
 CAR_RENTAL_BIN = PROJECT_ROOT / "car_rental"
 DEFAULT_INTERVAL = 1  # seconds between commands
+AUTO_CAR_ID = re.compile(r"auto-(\d+)")
+CUSTOMER_ID = re.compile(r"C(\d+)")
+FIRST_CUSTOMER_INDEX = 1000
+CAR_MODELS = ("Atlas", "Falcon", "Nimbus", "Comet", "Vertex")
+CAR_CONDITIONS = ("excellent", "good", "fair", "minordamages")
+CUSTOMER_COMMANDS = ("return", "rent", "list")
+RENTED_PREFIX = "Rented by the user ID: "
+RENTED_PREFIX_LEN = len(RENTED_PREFIX)
+CLI_SAVE = b"\nsave\n"
+CLI_EXIT = b"exit\n"
+# `stats` answers with this line once everything before it has been applied
+CLI_SYNC = b"stats\n"
+CLI_SYNC_MARKER = b"Tracked cars:"
+
+
+FileStamp = Tuple[int, int, int]
+
+
+def file_stamp(path: Path) -> Optional[FileStamp]:
+    """(mtime, size, inode): mtime alone can repeat across quick rewrites."""
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+    except FileNotFoundError:
+        return None
 
 
 def read_lines(path: Path) -> List[str]:
-    if not path.exists():
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
         return []
-    with path.open("r", encoding="utf-8") as handle:
-        return [line.strip() for line in handle if line.strip()]
+    return [line for raw in data.decode("utf-8").split("\n") if (line := raw.strip())]
+
+
+def max_id_suffix(ids: Iterable[str], pattern: re.Pattern[str]) -> int:
+    best = 0
+    for value in ids:
+        match = pattern.fullmatch(value)
+        if match:
+            best = max(best, int(match.group(1)))
+    return best
 
 
-@dataclass
+def parse_price(raw: str) -> float:
+    try:
+        return float(raw)
+    except ValueError:
+        return 0.0
+
+
+@dataclass(slots=True)
 class CarRecord:
     car_id: str
     model: str
@@ -45,20 +91,19 @@ class CarRecord:
 
     @property
     def renter_id(self) -> Optional[str]:
-        stamp = "Rented by the user ID: "
-        if self.status.startswith(stamp):
-            return self.status[len(stamp):]
+        if self.status.startswith(RENTED_PREFIX):
+            return self.status[RENTED_PREFIX_LEN:]
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Customer:
     name: str
     user_id: str
     password: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Manager:
     name: str
     user_id: str
@@ -66,52 +111,89 @@ class Manager:
 
 
 class FleetState:
+    """In-memory view of the text databases, kept alive across ticks.
+
+    Our own writes update the cached file stamps, and commands queued for
+    the CLI are mirrored through add_car()/mark_rented()/mark_returned(),
+    so reload() only re-parses files that someone else rewrote.
+    """
+
+    FILES = {"cars": CARS_FILE, "customers": CUSTOMERS_FILE, "managers": MANAGERS_FILE}
+
     def __init__(self) -> None:
         self.cars: List[CarRecord] = []
         self.customers: List[Customer] = []
+        self.customers_by_id: Dict[str, Customer] = {}
         self.managers: List[Manager] = []
         self.cars_by_renter: Dict[str, List[CarRecord]] = {}
+        self._car_by_id: Dict[str, CarRecord] = {}
+        # dict used as an insertion-ordered set so picks stay reproducible
+        self._available_ids: Dict[str, None] = {}
+        self.dirty: Set[str] = set()
+        self._next_auto_car_idx = 1
+        self._next_customer_idx = FIRST_CUSTOMER_INDEX
+        self._stamps: Dict[Path, Optional[FileStamp]] = {}
         self._load()
 
     def _load(self) -> None:
-        self._load_cars()
-        self._load_customers()
-        self._load_managers()
-
-    def reload(self) -> None:
-        self._load()
+        self.dirty.update(self.FILES)
+        self.reload()
+
+    def reload(self) -> Set[str]:
+        """Re-parse changed databases and return the names that were reloaded."""
+        for name, path in self.FILES.items():
+            stamp = file_stamp(path)
+            if stamp is None:
+                # missing, e.g. mid remove+rename in the CLI's writer: keep what we have
+                continue
+            if name in self.dirty or stamp != self._stamps.get(path):
+                self._stamps[path] = stamp
+                self.dirty.add(name)
+        if "cars" in self.dirty:
+            self._load_cars()
+        if "customers" in self.dirty:
+            self._load_customers()
+        if "managers" in self.dirty:
+            self._load_managers()
+        reloaded = set(self.dirty)
+        self.dirty.clear()
+        return reloaded
 
     def _load_cars(self) -> None:
         self.cars.clear()
         self.cars_by_renter.clear()
+        self._car_by_id.clear()
+        self._available_ids.clear()
         for raw in read_lines(CARS_FILE):
-            parts = [segment.strip() for segment in raw.split(",")]
-            if len(parts) < 4:
+            row = [segment.strip() for segment in raw.split(",")]
+            if len(row) < 4:
                 continue
-            car_id = parts[0]
-            if len(parts) == 4:
-                model = car_id
-                condition = parts[1]
-                price_str = parts[2]
-                status = parts[3]
-            else:
-                model = parts[1]
-                condition = parts[2]
-                price_str = parts[3]
-                status = parts[4]
-            try:
-                price = float(price_str)
-            except ValueError:
-                price = 0.0
+            if len(row) == 4:
+                # legacy rows omit the model; the CLI falls back to the id
+                row.insert(1, row[0])
+            car_id, model, condition, price_str, status = row[:5]
             record = CarRecord(car_id=car_id, model=model, condition=condition,
-                               price=price, status=status)
+                               price=parse_price(price_str), status=status)
             self.cars.append(record)
-            renter = record.renter_id
-            if renter:
-                self.cars_by_renter.setdefault(renter, []).append(record)
+            self._car_by_id[car_id] = record
+        # index only the last row per id, which is also the one the CLI keeps
+        for car_id, record in self._car_by_id.items():
+            status = record.status
+            if status == "Available":
+                self._available_ids[car_id] = None
+            elif status.startswith(RENTED_PREFIX):
+                renter = status[RENTED_PREFIX_LEN:]
+                if renter:
+                    self.cars_by_renter.setdefault(renter, []).append(record)
+        # never hand out an id again, even if the car it named is gone from disk
+        self._next_auto_car_idx = max(
+            self._next_auto_car_idx,
+            max_id_suffix((car.car_id for car in self.cars), AUTO_CAR_ID) + 1,
+        )
 
     def _load_customers(self) -> None:
         self.customers = []
+        self.customers_by_id = {}
         for raw in read_lines(CUSTOMERS_FILE):
             parts = raw.split(",")
             if len(parts) < 3:
@@ -119,7 +201,13 @@ class FleetState:
             name = parts[0].strip()
             user_id = parts[1].strip()
             password = parts[2].strip()
-            self.customers.append(Customer(name, user_id, password))
+            customer = Customer(name, user_id, password)
+            self.customers.append(customer)
+            self.customers_by_id[customer.user_id] = customer
+        self._next_customer_idx = max(
+            self._next_customer_idx,
+            max_id_suffix((cust.user_id for cust in self.customers), CUSTOMER_ID) + 1,
+        )
 
     def _load_managers(self) -> None:
         self.managers = []
@@ -133,46 +221,93 @@ class FleetState:
             self.managers.append(Manager(name, user_id, password))
 
     def available_cars(self) -> List[CarRecord]:
-        return [car for car in self.cars if car.is_available]
+        return [self._car_by_id[car_id] for car_id in self._available_ids]
+
+    def add_car(self, car: CarRecord) -> None:
+        self.cars.append(car)
+        self._car_by_id[car.car_id] = car
+        if car.is_available:
+            self._available_ids[car.car_id] = None
+
+    def remove_car(self, car: CarRecord) -> None:
+        self.cars.remove(car)
+        self._car_by_id.pop(car.car_id, None)
+        self._available_ids.pop(car.car_id, None)
+
+    def add_customer(self, customer: Customer) -> None:
+        self.customers.append(customer)
+        self.customers_by_id[customer.user_id] = customer
+
+    def remove_customer(self, customer: Customer) -> None:
+        # drop every row with this id so the list and customers_by_id agree
+        self.customers = [c for c in self.customers if c.user_id != customer.user_id]
+        self.customers_by_id.pop(customer.user_id, None)
+
+    def mark_rented(self, car: CarRecord, user_id: str) -> None:
+        car.status = f"{RENTED_PREFIX}{user_id}"
+        self._available_ids.pop(car.car_id, None)
+        self.cars_by_renter.setdefault(user_id, []).append(car)
+
+    def mark_returned(self, car: CarRecord) -> None:
+        renter = car.renter_id
+        if renter in self.cars_by_renter:
+            rentals = [c for c in self.cars_by_renter[renter] if c is not car]
+            if rentals:
+                self.cars_by_renter[renter] = rentals
+            else:
+                del self.cars_by_renter[renter]
+        car.status = "Available"
+        self._available_ids[car.car_id] = None
+
+    def release_rentals(self, user_id: str) -> List[CarRecord]:
+        released = self.cars_by_renter.pop(user_id, [])
+        for car in released:
+            car.status = "Available"
+            self._available_ids[car.car_id] = None
+        return released
 
     def cars_rented_by(self, user_id: str) -> List[CarRecord]:
         return list(self.cars_by_renter.get(user_id, []))
 
     def next_car_id(self) -> str:
-        existing_ids = {car.car_id for car in self.cars}
-        index = len(existing_ids) + 1
-        while True:
-            candidate = f"auto-{index}"
-            if candidate not in existing_ids:
-                return candidate
-            index += 1
+        candidate = f"auto-{self._next_auto_car_idx}"
+        self._next_auto_car_idx += 1
+        return candidate
 
     def next_customer_id(self) -> str:
-        existing = {cust.user_id for cust in self.customers}
-        index = len(existing) + 1000
-        while True:
-            candidate = f"C{index}"
-            if candidate not in existing:
-                return candidate
-            index += 1
+        candidate = f"C{self._next_customer_idx}"
+        self._next_customer_idx += 1
+        return candidate
 
     def write_cars(self) -> None:
-        with CARS_FILE.open("w", encoding="utf-8") as handle:
-            for car in self.cars:
-                handle.write(
-                    f"{car.car_id},{car.model},{car.condition},{car.price:.0f},"
-                    f"{car.status}\n"
-                )
+        CARS_FILE.write_text(
+            "".join(
+                f"{car.car_id},{car.model},{car.condition},{car.price:.0f},"
+                f"{car.status}\n"
+                for car in self.cars
+            ),
+            encoding="utf-8",
+        )
+        self._stamps[CARS_FILE] = file_stamp(CARS_FILE)
 
     def write_customers(self) -> None:
-        with CUSTOMERS_FILE.open("w", encoding="utf-8") as handle:
-            for cust in self.customers:
-                handle.write(
-                    f"{cust.name},{cust.user_id},{cust.password}\n"
-                )
+        CUSTOMERS_FILE.write_text(
+            "".join(f"{cust.name},{cust.user_id},{cust.password}\n" for cust in self.customers),
+            encoding="utf-8",
+        )
+        self._stamps[CUSTOMERS_FILE] = file_stamp(CUSTOMERS_FILE)
+
+
+_LOGGED: Optional[Dict[str, Set[str]]] = None
+_LOGGED_STAMP: Optional[FileStamp] = None
 
 
 def load_loggedin() -> Dict[str, Set[str]]:
+    """Return the cached session map, re-reading loggedin.txt only if it changed."""
+    global _LOGGED, _LOGGED_STAMP
+    stamp = file_stamp(LOGGEDIN_FILE)
+    if _LOGGED is not None and stamp == _LOGGED_STAMP:
+        return _LOGGED
     logged: Dict[str, Set[str]] = {"customer": set(), "manager": set()}
     for raw in read_lines(LOGGEDIN_FILE):
         try:
@@ -180,25 +315,110 @@ def load_loggedin() -> Dict[str, Set[str]]:
             logged.setdefault(role, set()).add(user_id)
         except ValueError:
             continue
+    _LOGGED, _LOGGED_STAMP = logged, stamp
     return logged
 
 
 def save_loggedin(logged: Dict[str, Set[str]]) -> None:
-    lines: List[str] = []
-    for role, ids in logged.items():
-        for user_id in sorted(ids):
-            lines.append(f"{role}:{user_id}")
-    with LOGGEDIN_FILE.open("w", encoding="utf-8") as handle:
-        handle.write("\n".join(lines))
+    global _LOGGED, _LOGGED_STAMP
+    payload = "\n".join(
+        f"{role}:{user_id}" for role in sorted(logged) for user_id in sorted(logged[role])
+    )
+    tmp_path = LOGGEDIN_FILE.with_name(LOGGEDIN_FILE.name + ".tmp")
+    tmp_path.write_text(payload, encoding="utf-8")
+    os.replace(tmp_path, LOGGEDIN_FILE)
+    _LOGGED, _LOGGED_STAMP = logged, file_stamp(LOGGEDIN_FILE)
+
+
+def _echo(output: bytes) -> None:
+    sys.stdout.write(output.decode("utf-8", "replace"))
+    sys.stdout.flush()
+
+
+class CliSession:
+    """A long-lived car_rental process that receives commands over stdin.
+
+    Commands queued during a tick are written as one batch followed by a
+    single save when main() flushes at the end of the tick; flush() blocks
+    until the CLI has applied them. The CLI keeps its own copy of cars.txt
+    in memory, so close() it before cars.txt is rewritten by anyone else;
+    the next flush() starts a fresh process.
+    """
 
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen[bytes]] = None
+        self._pending: List[str] = []
+
+    def _process(self) -> subprocess.Popen[bytes]:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen([str(CAR_RENTAL_BIN), "--backend=file"],
+                                          stdin=subprocess.PIPE,
+                                          stdout=subprocess.PIPE,
+                                          cwd=PROJECT_ROOT)
+        return self._proc
+
+    def _take_batch(self) -> bytes:
+        if not self._pending:
+            return b""
+        payload = "\n".join(self._pending).encode() + CLI_SAVE
+        self._pending.clear()
+        return payload
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def queue(self, *commands: str) -> None:
+        self._pending.extend(commands)
+
+    def flush(self) -> None:
+        payload = self._take_batch()
+        if not payload:
+            return
+        for _ in range(2):
+            proc = self._process()
+            assert proc.stdin is not None and proc.stdout is not None
+            try:
+                proc.stdin.write(payload + CLI_SYNC)
+                proc.stdin.flush()
+            except BrokenPipeError:
+                # the CLI died under us; respawn once and resend
+                self._proc = None
+                continue
+            for line in iter(proc.stdout.readline, b""):
+                if CLI_SYNC_MARKER in line:
+                    break
+                _echo(line)
+            return
+
+    def close(self) -> None:
+        payload = self._take_batch()
+        if payload:
+            self._process()
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            try:
+                output, _ = proc.communicate(payload + CLI_EXIT)
+                _echo(output)
+            except BrokenPipeError:
+                proc.wait()
 
-def run_cli_command(command: str) -> None:
-    payload = f"{command}\nsave\nexit\n"
-    subprocess.run([str(CAR_RENTAL_BIN), "--backend=file"],
-                   input=payload,
-                   text=True,
-                   cwd=PROJECT_ROOT,
-                   check=False)
+
+CLI = CliSession()
+RNG = random.Random()
+atexit.register(CLI.close)
+
+
+def run_cli_command(*commands: str) -> None:
+    CLI.queue(*commands)
+
+
+def sync_cli(state: FleetState) -> None:
+    """Stop the CLI and pick up its writes before we edit cars.txt ourselves."""
+    CLI.close()
+    state.reload()
 
 
 def login_role(role: str, user_id: str) -> None:
@@ -218,154 +438,174 @@ def logout_role(role: str, user_id: str) -> None:
         print(f"[LOGOUT] {role} {user_id}")
 
 
-def choose_logged_in_customer(state: FleetState, logged: Dict[str, Set[str]]) -> Optional[Customer]:
-    logged_ids = list(logged.get("customer", set()))
+def choose_logged_in_customer(state: FleetState, logged: Dict[str, Set[str]],
+                              rng: random.Random = RNG) -> Optional[Customer]:
+    # sorted first: set order follows per-process string hashing, not the seed
+    logged_ids = sorted(logged.get("customer", set()))
     if not logged_ids:
         return None
-    id_to_customer = {cust.user_id: cust for cust in state.customers}
-    random.shuffle(logged_ids)
+    rng.shuffle(logged_ids)
     for cid in logged_ids:
-        customer = id_to_customer.get(cid)
+        customer = state.customers_by_id.get(cid)
         if customer:
             return customer
     return None
 
 
-def choose_customer_to_login(state: FleetState, logged: Dict[str, Set[str]]) -> Optional[Customer]:
-    available = [c for c in state.customers if c.user_id not in logged.get("customer", set())]
+def choose_customer_to_login(state: FleetState, logged: Dict[str, Set[str]],
+                             rng: random.Random = RNG) -> Optional[Customer]:
+    online = logged.get("customer", set())
+    available = [c for c in state.customers if c.user_id not in online]
     if not available:
         return None
-    return random.choice(available)
+    return rng.choice(available)
 
 
-def choose_manager(state: FleetState, logged: Dict[str, Set[str]]) -> Optional[Manager]:
+def choose_manager(state: FleetState, logged: Dict[str, Set[str]],
+                   rng: random.Random = RNG) -> Optional[Manager]:
     if not state.managers:
         return None
-    available = [m for m in state.managers if m.user_id not in logged.get("manager", set())]
+    online = logged.get("manager", set())
+    available = [m for m in state.managers if m.user_id not in online]
     if not available:
         return None
-    return random.choice(available)
+    return rng.choice(available)
 
 
-def customer_command(state: FleetState, customer: Customer) -> Optional[str]:
+def customer_command(state: FleetState, customer: Customer,
+                     rng: random.Random = RNG) -> Optional[str]:
+    """Pick the customer's next command and apply it to state as the CLI will."""
     rentals = state.cars_rented_by(customer.user_id)
     available = state.available_cars()
-    dice = random.random()
-    if rentals and dice < 0.4:
-        car = random.choice(rentals)
+    # return 40%, rent the rest of 90%, list otherwise; empty options drop out
+    return_weight = 0.4 if rentals else 0.0
+    rent_weight = 0.9 - return_weight if available else 0.0
+    kind = rng.choices(CUSTOMER_COMMANDS,
+                       weights=(return_weight, rent_weight, 1.0 - return_weight - rent_weight))[0]
+    if kind == "return":
+        car = rng.choice(rentals)
+        state.mark_returned(car)
         return f"return {car.car_id}"
-    if available and dice < 0.9:
-        car = random.choice(available)
+    if kind == "rent":
+        car = rng.choice(available)
+        state.mark_rented(car, customer.user_id)
         return f"rent {car.car_id} {customer.user_id}"
     return "list 5"
 
 
-def manager_action(state: FleetState) -> str:
+def manager_action(state: FleetState, rng: random.Random = RNG) -> str:
+    """Pick a new car to add and apply it to state as the CLI will."""
     car_id = state.next_car_id()
-    model = random.choice(["Atlas", "Falcon", "Nimbus", "Comet", "Vertex"])
-    condition = random.choice(["excellent", "good", "fair", "minordamages"])
-    price = random.randint(2500, 7800)
+    model = rng.choice(CAR_MODELS)
+    condition = rng.choice(CAR_CONDITIONS)
+    price = rng.randint(2500, 7800)
+    state.add_car(CarRecord(car_id=car_id, model=model, condition=condition,
+                            price=float(price), status="Available"))
     return f"add {car_id} {model} {condition} {price}"
 
 
-def add_customer_action(state: FleetState) -> None:
-    state.reload()
+def add_customer_action(state: FleetState, rng: random.Random = RNG) -> None:
     user_id = state.next_customer_id()
     name = f"AutoCustomer{user_id[-3:]}"
     password = f"auto{user_id[-3:]}"
-    state.customers.append(Customer(name, user_id, password))
+    state.add_customer(Customer(name, user_id, password))
     state.write_customers()
     print(f"[ADD-CUSTOMER] {user_id}")
     # ensure the new customer starts with a car if possible
-    state.reload()
     available = state.available_cars()
     if available:
-        car = random.choice(available)
+        car = rng.choice(available)
+        state.mark_rented(car, user_id)
         cmd = f"rent {car.car_id} {user_id}"
         print(f"[CMD] {cmd}")
         run_cli_command(cmd)
 
 
-def add_car_action(state: FleetState) -> None:
-    state.reload()
-    cmd = manager_action(state)
+def add_car_action(state: FleetState, rng: random.Random = RNG) -> None:
+    cmd = manager_action(state, rng)
     print(f"[CMD] {cmd}")
     run_cli_command(cmd)
 
 
-def remove_available_car_action(state: FleetState) -> None:
-    state.reload()
+def remove_available_car_action(state: FleetState, rng: random.Random = RNG) -> None:
+    sync_cli(state)
     available = state.available_cars()
     if not available:
         print("[INFO] No available car to remove.")
         return
-    car = random.choice(available)
-    state.cars = [c for c in state.cars if c.car_id != car.car_id]
+    car = rng.choice(available)
+    state.remove_car(car)
     state.write_cars()
     print(f"[REMOVE-CAR] {car.car_id}")
 
 
-def force_remove_customer_action(state: FleetState) -> None:
-    state.reload()
+def force_remove_customer_action(state: FleetState, rng: random.Random = RNG) -> None:
+    sync_cli(state)
     if not state.customers:
         print("[INFO] No customer to remove.")
         return
-    victim = random.choice(state.customers)
-    state.customers = [c for c in state.customers if c.user_id != victim.user_id]
-    # release their cars
-    for car in state.cars:
-        if car.renter_id == victim.user_id:
-            car.status = "Available"
+    victim = rng.choice(state.customers)
+    state.remove_customer(victim)
     state.write_customers()
-    state.write_cars()
+    if state.release_rentals(victim.user_id):
+        state.write_cars()
     logout_role("customer", victim.user_id)
     print(f"[REMOVE-CUSTOMER] {victim.user_id}")
 
 
-def login_customer_action(state: FleetState) -> None:
-    state.reload()
+def login_customer_action(state: FleetState, rng: random.Random = RNG) -> None:
     logged = load_loggedin()
-    candidate = choose_customer_to_login(state, logged)
+    candidate = choose_customer_to_login(state, logged, rng)
     if not candidate:
         print("[INFO] No offline customer to login.")
         return
     login_role("customer", candidate.user_id)
 
 
-def customer_session_action(interval: int) -> None:
-    state = FleetState()
+def customer_session_action(state: FleetState, interval: int, rng: random.Random = RNG) -> None:
     logged = load_loggedin()
-    customer = choose_logged_in_customer(state, logged)
+    customer = choose_logged_in_customer(state, logged, rng)
     if not customer:
         print("[INFO] No logged-in customer available.")
         return
     login_role("customer", customer.user_id)
-    state.reload()
-    command = customer_command(state, customer)
+    command = customer_command(state, customer, rng)
     if not command:
         return
     print(f"[CMD] {command}")
     run_cli_command(command)
 
 
-def main() -> None:
+def main(seed: Optional[int] = None) -> None:
     interval = DEFAULT_INTERVAL
-    random.seed()
+    rng = RNG
+    rng.seed(seed)
+    rand = rng.random
+    state = FleetState()
     while True:
         try:
-            roll = random.random()
+            if "cars" in state.reload():
+                # cars.txt changed outside our flushes; the CLI's copy is stale
+                CLI.close()
+            roll = rand()
             if roll < 0.45:
-                customer_session_action(interval)
+                customer_session_action(state, interval, rng)
             elif roll < 0.55:
-                login_customer_action(FleetState())
+                login_customer_action(state, rng)
             elif roll < 0.65:
-                add_customer_action(FleetState())
+                add_customer_action(state, rng)
             elif roll < 0.75:
-                add_car_action(FleetState())
+                add_car_action(state, rng)
             elif roll < 0.85:
-                remove_available_car_action(FleetState())
+                remove_available_car_action(state, rng)
             else:
-                force_remove_customer_action(FleetState())
+                force_remove_customer_action(state, rng)
+            if CLI.pending:
+                # queued commands were mirrored into state up front; re-read
+                # cars.txt even if the CLI rejected them and left it untouched
+                state.dirty.add("cars")
+            CLI.flush()
+            state.reload()
         except Exception as exc:  # pragma: no cover - best-effort daemon
             print(f"[ERROR] {exc}")
         finally: